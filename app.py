@@ -2,23 +2,58 @@
 from __future__ import annotations
 
 import csv
+import hashlib
 import io
+import bisect
+import itertools
+import multiprocessing
+import operator
 import os
 import re
+import sqlite3
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+import ahocorasick
 import numpy as np
 import nltk
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from flask import Flask, Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider, JSONProvider
 from flask_cors import CORS
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 
 # =============================================================
 # APP SETUP
 # =============================================================
+class OrjsonProvider(JSONProvider):
+    """
+    jsonify()/get_json() backed by orjson. Keys stay sorted like Flask's default.
+    """
+
+    option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=DefaultJSONProvider.default, option=self.option).decode("utf-8")
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=DefaultJSONProvider.default, option=self.option)
+        return self._app.response_class(body, mimetype="application/json")
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
 # =============================================================
@@ -31,7 +66,6 @@ def _ensure_nltk_resource(path: str, download_name: str) -> None:
         nltk.download(download_name, quiet=True)
 
 _ensure_nltk_resource("sentiment/vader_lexicon.zip", "vader_lexicon")
-_ensure_nltk_resource("tokenizers/punkt", "punkt")
 
 analyzer = SentimentIntensityAnalyzer()
 
@@ -41,17 +75,34 @@ analyzer = SentimentIntensityAnalyzer()
 POSITIVE_THRESHOLD = 0.2
 NEGATIVE_THRESHOLD = -0.2
 
+# Compact sentiment encoding for vectorized counting (anything else = neutral)
+SENTIMENT_CODES: Dict[str, int] = {"Neutral": 0, "Positive": 1, "Negative": 2}
+SENTIMENT_LABELS: Tuple[str, ...] = ("Neutral", "Positive", "Negative")  # index = code
+
 DEFAULT_REVIEW_CHUNK_SIZE = 20
+EXPORT_CSV_CHUNK_ROWS = 64
 STEAM_REVIEWS_PER_PAGE = 100
 
-REQUEST_SLEEP_SECONDS = 0.6
-APPDETAILS_ITEM_SLEEP_SECONDS = 0.05
+# Review pages go through one token bucket shared by every /analyze thread:
+# short runs go out back to back, long ones settle at the sustained rate.
+STEAM_PAGES_PER_SECOND = 1.5
+STEAM_PAGE_BURST = 4
 
 CACHE_TTL_SECONDS = 30 * 60
 CACHE_MAX_ITEMS = 50
+CACHE_MAX_TEXT_ITEMS = 10
 
 APPDETAILS_TTL_SECONDS = 24 * 60 * 60
-APPDETAILS_CACHE: Dict[str, Dict[str, Any]] = {}
+APPDETAILS_CACHE_MAX_ITEMS = 2000
+
+REVIEW_SCORE_CACHE_MAX_ITEMS = 200_000  # ~240 bytes/entry (digest, tuple, float, LRU link): ~48 MB full
+APPDETAILS_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+# /search fans appdetails lookups out to threads; guards APPDETAILS_CACHE
+APPDETAILS_CACHE_LOCK = threading.Lock()
+
+# Shared on-disk tier behind APPDETAILS_CACHE: every gunicorn worker reads it
+# and it survives restarts. Set APPDETAILS_DB_PATH="" to disable.
+APPDETAILS_DB_PATH = os.getenv("APPDETAILS_DB_PATH", "appdetails.db")
 
 MAX_REVIEW_COUNT = 5000
 MIN_REVIEW_COUNT = 1
@@ -59,6 +110,28 @@ MIN_REVIEW_COUNT = 1
 STEAM_TIMEOUT_SECONDS = 60
 STEAM_RETRY_MAX = 4
 
+# Shared keep-alive pool for all Steam calls. pool_maxsize must cover the
+# fetch + appdetails thread pools so workers never open throwaway sockets.
+STEAM_POOL_CONNECTIONS = 20
+STEAM_POOL_MAXSIZE = 50
+
+# Per-review scoring (sentence extraction + VADER + theme tags) is pure CPU,
+# so large batches are farmed out to worker processes. 1 worker = serial.
+SCORE_POOL_WORKERS = max(1, int(os.getenv("SCORE_POOL_WORKERS", str(os.cpu_count() or 1))))
+SCORE_POOL_MIN_BATCH = 64
+SCORE_POOL_CHUNK_SIZE = 16
+
+STEAM_FETCH_WORKERS = 4
+
+SEARCH_MAX_RESULTS = 10
+APPDETAILS_FETCH_WORKERS = SEARCH_MAX_RESULTS
+
+# Playtime histogram: inner bucket edges only. Buckets are [lo, hi) with "<1"
+# and "100+" open-ended, so bucket index = number of edges <= value.
+PLAYTIME_BIN_EDGES = np.array([1, 5, 10, 20, 50, 100], dtype=np.float64)
+PLAYTIME_QUANTILES = np.array([0.25, 0.5, 0.75])
+PLAYTIME_BIN_LABELS: Tuple[str, ...] = ("<1", "1–5", "5–10", "10–20", "20–50", "50–100", "100+")
+
 # =============================================================
 # THEMATIC KEYWORDS
 # =============================================================
@@ -109,39 +182,184 @@ VALUE_KEYWORDS = [
 ]
 
 # =============================================================
-# REGEX HELPERS
+# AHO–CORASICK THEME MATCHER
 # =============================================================
-def compile_keyword_pattern(keywords: List[str]) -> re.Pattern:
-    parts: List[str] = []
-    for k in keywords:
-        k = (k or "").strip()
-        if not k:
-            continue
-        if " " in k or "-" in k:
-            parts.append(re.escape(k))
-        else:
-            parts.append(r"\b" + re.escape(k) + r"\b")
-    if not parts:
-        return re.compile(r"(?!x)x")
-    return re.compile("|".join(parts), re.IGNORECASE)
+THEME_ORDER: Tuple[str, ...] = ("length", "grind", "value")
+THEME_BITS: Dict[str, int] = {"length": 1, "grind": 2, "value": 4}
+ALL_THEMES_MASK = sum(THEME_BITS.values())
+
+# mask -> theme names (THEME_ORDER order), precomputed for all 8 combinations
+THEME_NAMES_BY_MASK: Tuple[Tuple[str, ...], ...] = tuple(
+    tuple(t for t in THEME_ORDER if mask & THEME_BITS[t]) for mask in range(ALL_THEMES_MASK + 1)
+)
+
+def build_theme_automaton(themed_keywords: Dict[str, List[str]]) -> ahocorasick.Automaton:
+    """
+    One automaton over every (lowercased) keyword. Each word maps to
+    (keyword_length, needs_word_boundary, theme_bits) so a single pass over the
+    text yields every theme hit. Matching rules:
+    word boundaries for single tokens, exact match for phrases/hyphenated terms.
+    """
+    entries: Dict[str, int] = {}
+    for theme, keywords in themed_keywords.items():
+        for k in keywords:
+            k = (k or "").strip().lower()
+            if k:
+                entries[k] = entries.get(k, 0) | THEME_BITS[theme]
+
+    automaton = ahocorasick.Automaton()
+    for k, bits in entries.items():
+        needs_boundary = not (" " in k or "-" in k)
+        automaton.add_word(k, (len(k), needs_boundary, bits))
+    automaton.make_automaton()
+    return automaton
+
+THEME_AUTOMATON = build_theme_automaton(
+    {"length": LENGTH_KEYWORDS, "grind": GRIND_KEYWORDS, "value": VALUE_KEYWORDS}
+)
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+def _iter_theme_hits(lowered: str) -> Iterator[Tuple[int, int]]:
+    """
+    Yields (start_offset, theme_bits) for every keyword hit in already
+    lowercased text, applying the word-boundary rule for single tokens.
+    """
+    n = len(lowered)
+    for end, (length, needs_boundary, bits) in THEME_AUTOMATON.iter(lowered):
+        start = end - length + 1
+        if needs_boundary:
+            if start > 0 and _is_word_char(lowered[start - 1]):
+                continue
+            if end + 1 < n and _is_word_char(lowered[end + 1]):
+                continue
+        yield start, bits
 
-ALL_PATTERNS: Dict[str, re.Pattern] = {
-    "length": compile_keyword_pattern(LENGTH_KEYWORDS),
-    "grind": compile_keyword_pattern(GRIND_KEYWORDS),
-    "value": compile_keyword_pattern(VALUE_KEYWORDS),
-}
+# Sentence breaks: whitespace following terminal punctuation. No capital-letter
+# lookahead: many Steam reviews are written all lowercase.
+SENTENCE_BREAK_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+def _sentence_spans(text: str) -> List[Tuple[int, int]]:
+    spans: List[Tuple[int, int]] = []
+    start = 0
+    for m in SENTENCE_BREAK_PATTERN.finditer(text):
+        spans.append((start, m.start()))
+        start = m.end()
+    spans.append((start, len(text)))
+    return spans
 
 # =============================================================
-# CACHES
+# REVIEW STORAGE (struct-of-arrays)
 # =============================================================
-TEMP_REVIEW_CACHE: Dict[str, Dict[str, Any]] = {}
+@dataclass
+class ReviewColumns:
+    """
+    Collected reviews stored column-wise (row i = i-th review Steam returned).
+    Review text is kept separately in REVIEW_TEXT_CACHE; per-review dicts are
+    only built when reviews are served or exported.
+    """
+    size: int = 0
+    playtime_hours: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float64))
+    sentiment_code: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int8))
+    sentiment_compound: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float64))
+    theme_mask: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.uint8))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def reserve(self, capacity: int) -> None:
+        if capacity <= self.theme_mask.size:
+            return
+        n = len(self)
+        for name in ("playtime_hours", "sentiment_code", "sentiment_compound", "theme_mask"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:n] = old[:n]
+            setattr(self, name, new)
+
+    def extend(self, playtime_hours: List[float], scores: List[Tuple[str, float, int]]) -> None:
+        """
+        Appends a page of rows; `scores` are (sentiment_label, compound, theme_mask).
+        Each column is written with one slice assignment.
+        """
+        n = len(scores)
+        i = self.size
+        if i + n > self.theme_mask.size:
+            self.reserve(max(STEAM_REVIEWS_PER_PAGE, 2 * self.theme_mask.size, i + n))
+
+        labels, compounds, masks = zip(*scores) if scores else ((), (), ())
+        self.playtime_hours[i:i + n] = playtime_hours
+        self.sentiment_code[i:i + n] = [SENTIMENT_CODES.get(label, 0) for label in labels]
+        self.sentiment_compound[i:i + n] = compounds
+        self.theme_mask[i:i + n] = masks
+        self.size = i + n
+
+    def themed_indices(self, count: int) -> np.ndarray:
+        return np.flatnonzero(self.theme_mask[:count])
+
+    def theme_indices(self, theme: str, count: int) -> np.ndarray:
+        return np.flatnonzero(self.theme_mask[:count] & THEME_BITS[theme])
+
+    def theme_tags(self, i: int) -> List[str]:
+        return list(THEME_NAMES_BY_MASK[self.theme_mask[i]])
+
+    def row(self, i: int, review_text: str) -> Dict[str, Any]:
+        return {
+            "review_text": review_text,
+            "playtime_hours": float(self.playtime_hours[i]),
+            "sentiment_label": SENTIMENT_LABELS[int(self.sentiment_code[i])],
+            "sentiment_compound": float(self.sentiment_compound[i]),
+            "theme_tags": self.theme_tags(i),
+        }
 
-# IMPORTANT: support BOTH cache key formats (old + new)
-CACHE_KEY_V1 = "{app_id}_{review_count}_{review_filter}_{language}"   # old
-CACHE_KEY_V2 = "{app_id}_{review_filter}_{language}"                 # new
+@dataclass(slots=True)
+class CacheEntry:
+    """
+    One analysis in TEMP_REVIEW_CACHE. Its review texts live in
+    REVIEW_TEXT_CACHE under the same cache_id.
+    """
+    cache_id: str
+    created_at: float
+    effective_target_count: int
+    cursor: Optional[str] = "*"
+    steam_total_reviews: Optional[int] = None
+    columns: ReviewColumns = field(default_factory=ReviewColumns)
+    payload: Optional[Dict[str, Any]] = None
+    payload_key: Optional[Tuple[Any, ...]] = None
 
-def _now() -> float:
-    return time.time()
+# =============================================================
+# CACHES
+# =============================================================
+# Caches are LRU-ordered OrderedDicts: front = least recently stored/used.
+# Each analysis is stored ONCE under its entry.cache_id; the v1/v2 request
+# keys it answers to live in CACHE_ALIASES (key -> cache_id).
+TEMP_REVIEW_CACHE: "OrderedDict[str, CacheEntry]" = OrderedDict()
+CACHE_ALIASES: Dict[str, str] = {}
+# Requests run on threads: guards TEMP_REVIEW_CACHE, CACHE_ALIASES, REVIEW_TEXT_CACHE
+CACHE_LOCK = threading.RLock()
+_CACHE_ID_SEQ = itertools.count(1)
+
+# Review text is most of an analysis' memory but only /reviews and /export read
+# it, so it lives in a smaller tier, also keyed by cache_id. An analysis is
+# evicted together with its text, so every cached entry can serve /reviews
+# and /export, and CACHE_MAX_TEXT_ITEMS is the effective cap on analyses.
+REVIEW_TEXT_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+# Content-addressed (review text digest) -> (sentiment_label, sentiment_compound, theme_mask).
+# Outlives TEMP_REVIEW_CACHE entries, so duplicate reviews ("gg", "10/10") and
+# re-runs of an app at a different review_count skip scoring entirely.
+REVIEW_SCORE_CACHE: "OrderedDict[bytes, Tuple[str, float, int]]" = OrderedDict()
+REVIEW_SCORE_CACHE_LOCK = threading.Lock()
+
+# One /analyze at a time per v2 key (it extends that entry's columns in place);
+# different games still analyse concurrently.
+_ANALYSIS_LOCKS: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+_ANALYSIS_LOCKS_GUARD = threading.Lock()
+
+# Bound directly to the C function: no wrapper frame on hot cache paths.
+# Every cache record stores created_at as this float at insert time.
+_now = time.time
 
 def _safe_int(value: Any, default: int) -> int:
     try:
@@ -152,32 +370,59 @@ def _safe_int(value: Any, default: int) -> int:
 def _clamp(n: int, lo: int, hi: int) -> int:
     return max(lo, min(hi, n))
 
-def _purge_cache() -> None:
+def _purge_lru(
+    cache: "OrderedDict[str, Any]",
+    ttl_seconds: float,
+    max_items: int,
+    created_at: Callable[[Any], float] = operator.itemgetter("created_at"),
+) -> int:
+    # TTL: expire from the front and stop at the first live entry. An entry
+    # touched by a read can shield older ones behind it; those still fail the
+    # TTL check on lookup and are bounded by max_items.
     now = _now()
-    expired: List[str] = []
-    for k, v in TEMP_REVIEW_CACHE.items():
-        created_at = float(v.get("created_at", 0) or 0)
-        if (now - created_at) > CACHE_TTL_SECONDS:
-            expired.append(k)
-    for k in expired:
-        TEMP_REVIEW_CACHE.pop(k, None)
-
-    if len(TEMP_REVIEW_CACHE) > CACHE_MAX_ITEMS:
-        items = list(TEMP_REVIEW_CACHE.items())
-        items.sort(key=lambda kv: float(kv[1].get("created_at", 0) or 0))
-        to_remove = len(TEMP_REVIEW_CACHE) - CACHE_MAX_ITEMS
-        for i in range(to_remove):
-            TEMP_REVIEW_CACHE.pop(items[i][0], None)
+    evicted = 0
+    while cache:
+        item = next(iter(cache.values()))
+        if (now - created_at(item)) <= ttl_seconds:
+            break
+        cache.popitem(last=False)
+        evicted += 1
+
+    while len(cache) > max_items:
+        cache.popitem(last=False)
+        evicted += 1
+    return evicted
+
+def _sweep_orphans() -> None:
+    """
+    Keep the tiers in step: drop analyses whose review text was evicted, then
+    aliases and review text whose analysis entry is gone.
+    """
+    for cid in [cid for cid in TEMP_REVIEW_CACHE if cid not in REVIEW_TEXT_CACHE]:
+        del TEMP_REVIEW_CACHE[cid]
+    dead = [k for k, cid in CACHE_ALIASES.items() if cid not in TEMP_REVIEW_CACHE]
+    for k in dead:
+        del CACHE_ALIASES[k]
+    for cid in [cid for cid in REVIEW_TEXT_CACHE if cid not in TEMP_REVIEW_CACHE]:
+        del REVIEW_TEXT_CACHE[cid]
+
+def _purge_cache() -> None:
+    with CACHE_LOCK:
+        evicted = _purge_lru(TEMP_REVIEW_CACHE, CACHE_TTL_SECONDS, CACHE_MAX_ITEMS, operator.attrgetter("created_at"))
+        evicted += _purge_lru(REVIEW_TEXT_CACHE, CACHE_TTL_SECONDS, CACHE_MAX_TEXT_ITEMS)
+        if evicted:
+            _sweep_orphans()
+
+def _analysis_lock(key: str) -> threading.Lock:
+    with _ANALYSIS_LOCKS_GUARD:
+        lock = _ANALYSIS_LOCKS.get(key)
+        if lock is None:
+            lock = _ANALYSIS_LOCKS[key] = threading.Lock()
+        return lock
 
 def _purge_appdetails_cache() -> None:
-    now = _now()
-    expired: List[str] = []
-    for appid, item in APPDETAILS_CACHE.items():
-        created_at = float(item.get("created_at", 0) or 0)
-        if (now - created_at) > APPDETAILS_TTL_SECONDS:
-            expired.append(appid)
-    for appid in expired:
-        APPDETAILS_CACHE.pop(appid, None)
+    with APPDETAILS_CACHE_LOCK:
+        _purge_lru(APPDETAILS_CACHE, APPDETAILS_TTL_SECONDS, APPDETAILS_CACHE_MAX_ITEMS)
 
 def _cursor_ok(c: Any) -> bool:
     if c is None:
@@ -198,16 +443,14 @@ def _truthy_flag(v: Any, default: bool = True) -> bool:
 def _make_keys(app_id: str, review_filter: str, language: str, review_count: Optional[int]) -> Tuple[str, Optional[str]]:
     """
     Returns (v2_key, v1_key_or_none).
+    IMPORTANT: support BOTH cache key formats (old + new):
+      v1 (old): {app_id}_{review_count}_{review_filter}_{language}
+      v2 (new): {app_id}_{review_filter}_{language}
     """
-    k2 = CACHE_KEY_V2.format(app_id=app_id, review_filter=review_filter, language=language)
+    k2 = f"{app_id}_{review_filter}_{language}"
     k1 = None
     if review_count is not None:
-        k1 = CACHE_KEY_V1.format(
-            app_id=app_id,
-            review_count=int(review_count),
-            review_filter=review_filter,
-            language=language,
-        )
+        k1 = f"{app_id}_{int(review_count)}_{review_filter}_{language}"
     return k2, k1
 
 def _get_cached_entry(
@@ -215,22 +458,22 @@ def _get_cached_entry(
     review_filter: str,
     language: str,
     review_count_hint: Optional[int] = None
-) -> Optional[Dict[str, Any]]:
+) -> Optional[CacheEntry]:
     """
     Try v2 key first, then v1 (old) key if present.
     """
     k2, k1 = _make_keys(app_id, review_filter, language, review_count_hint)
-    entry = TEMP_REVIEW_CACHE.get(k2)
-    if isinstance(entry, dict):
-        return entry
-    if k1:
-        entry = TEMP_REVIEW_CACHE.get(k1)
-        if isinstance(entry, dict):
-            return entry
+    with CACHE_LOCK:
+        for k in (k2, k1):
+            cache_id = CACHE_ALIASES.get(k) if k else None
+            entry = TEMP_REVIEW_CACHE.get(cache_id) if cache_id else None
+            if entry is not None:
+                TEMP_REVIEW_CACHE.move_to_end(cache_id)
+                return entry
     return None
 
 def _store_entry_under_keys(
-    entry: Dict[str, Any],
+    entry: CacheEntry,
     app_id: str,
     review_filter: str,
     language: str,
@@ -238,42 +481,199 @@ def _store_entry_under_keys(
     effective_count: int
 ) -> None:
     """
-    Store the SAME entry under multiple keys so old /reviews and new /reviews both work.
+    Store the entry once and alias it under multiple keys so old /reviews and
+    new /reviews both work.
     """
     k2, k1_req = _make_keys(app_id, review_filter, language, requested_count)
-    _,  k1_eff = _make_keys(app_id, review_filter, language, effective_count)
+    k1_eff = f"{app_id}_{int(effective_count)}_{review_filter}_{language}"
+    cache_id = entry.cache_id
+
+    with CACHE_LOCK:
+        TEMP_REVIEW_CACHE[cache_id] = entry
+        TEMP_REVIEW_CACHE.move_to_end(cache_id)
+
+        replaced = False
+        for k in (k2, k1_req, k1_eff):
+            if k:
+                replaced |= CACHE_ALIASES.get(k, cache_id) != cache_id
+                CACHE_ALIASES[k] = cache_id
+
+        if replaced:
+            # Entries no key points at anymore can never be read again
+            live = set(CACHE_ALIASES.values())
+            for cid in [cid for cid in TEMP_REVIEW_CACHE if cid not in live]:
+                del TEMP_REVIEW_CACHE[cid]
+
+        evicted = False
+        while len(TEMP_REVIEW_CACHE) > CACHE_MAX_ITEMS:
+            TEMP_REVIEW_CACHE.popitem(last=False)
+            evicted = True
+
+        if replaced or evicted:
+            _sweep_orphans()
+
+def _get_review_texts(entry: CacheEntry) -> Optional[List[str]]:
+    """
+    Review texts for a cached entry, or None if they were evicted.
+    """
+    cache_id = entry.cache_id
+    with CACHE_LOCK:
+        node = REVIEW_TEXT_CACHE.get(cache_id)
+        if not isinstance(node, dict):
+            return None
+        REVIEW_TEXT_CACHE.move_to_end(cache_id)
+        return node.get("texts")
 
-    TEMP_REVIEW_CACHE[k2] = entry
-    if k1_req:
-        TEMP_REVIEW_CACHE[k1_req] = entry
-    if k1_eff:
-        TEMP_REVIEW_CACHE[k1_eff] = entry
+def _store_review_texts(entry: CacheEntry, texts: List[str]) -> None:
+    cache_id = entry.cache_id
+
+    with CACHE_LOCK:
+        REVIEW_TEXT_CACHE[cache_id] = {"created_at": _now(), "texts": texts}
+        REVIEW_TEXT_CACHE.move_to_end(cache_id)
+
+        while len(REVIEW_TEXT_CACHE) > CACHE_MAX_TEXT_ITEMS:
+            evicted_id, _ = REVIEW_TEXT_CACHE.popitem(last=False)
+            # Its analysis goes too; stale aliases are swept on the next purge
+            TEMP_REVIEW_CACHE.pop(evicted_id, None)
 
 # =============================================================
 # STEAM HELPERS
 # =============================================================
+def _build_steam_session() -> requests.Session:
+    # All retrying happens here: connect/read errors, throttling (429/503,
+    # honoring Retry-After) and transient 5xx, with exponential backoff.
+    # STEAM_RETRY_MAX counts attempts, so retries = attempts - 1.
+    retry = Retry(
+        total=STEAM_RETRY_MAX - 1,
+        backoff_factor=1.0,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=STEAM_POOL_CONNECTIONS,
+        pool_maxsize=STEAM_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+SESSION = _build_steam_session()
+
+def _decode_json(resp: requests.Response) -> Any:
+    try:
+        return orjson.loads(resp.content)
+    except orjson.JSONDecodeError:
+        # orjson rejects lone surrogate escapes (broken emoji in user text);
+        # the stdlib decoder accepts them, so don't lose the whole page.
+        return resp.json()
+
+_APPDETAILS_DB: Optional[sqlite3.Connection] = None
+_APPDETAILS_DB_PID = 0
+_APPDETAILS_DB_LOCK = threading.Lock()
+
+def _appdetails_db() -> Optional[sqlite3.Connection]:
+    """
+    This process' connection (re-opened after a fork), or None when the disk
+    tier is disabled/unavailable. Caller holds _APPDETAILS_DB_LOCK.
+    """
+    global _APPDETAILS_DB, _APPDETAILS_DB_PID
+    if _APPDETAILS_DB_PID == os.getpid():
+        return _APPDETAILS_DB
+
+    _APPDETAILS_DB_PID = os.getpid()
+    _APPDETAILS_DB = None
+    if not APPDETAILS_DB_PATH:
+        return None
+
+    try:
+        db = sqlite3.connect(APPDETAILS_DB_PATH, timeout=5, isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS appdetails "
+            "(appid TEXT PRIMARY KEY, created_at REAL NOT NULL, data BLOB NOT NULL)"
+        )
+        db.execute("DELETE FROM appdetails WHERE created_at <= ?", (_now() - APPDETAILS_TTL_SECONDS,))
+        _APPDETAILS_DB = db
+    except sqlite3.Error as e:
+        print(f"[appdetails] Disk cache disabled: {e}")
+    return _APPDETAILS_DB
+
+def _appdetails_db_get(app_id: str) -> Optional[Tuple[float, Dict[str, str]]]:
+    with _APPDETAILS_DB_LOCK:
+        db = _appdetails_db()
+        if db is None:
+            return None
+        try:
+            row = db.execute(
+                "SELECT created_at, data FROM appdetails WHERE appid = ? AND created_at > ?",
+                (app_id, _now() - APPDETAILS_TTL_SECONDS),
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"[appdetails] Disk cache read error: {e}")
+            return None
+
+    if row is None:
+        return None
+    try:
+        details = orjson.loads(row[1])
+    except orjson.JSONDecodeError:
+        return None
+    return (row[0], details) if isinstance(details, dict) else None
+
+def _appdetails_db_put(app_id: str, created_at: float, details: Dict[str, str]) -> None:
+    with _APPDETAILS_DB_LOCK:
+        db = _appdetails_db()
+        if db is None:
+            return
+        try:
+            db.execute(
+                "INSERT OR REPLACE INTO appdetails (appid, created_at, data) VALUES (?, ?, ?)",
+                (app_id, created_at, orjson.dumps(details)),
+            )
+        except sqlite3.Error as e:
+            print(f"[appdetails] Disk cache write error: {e}")
+
+def _remember_appdetails(app_id: str, created_at: float, details: Dict[str, str]) -> None:
+    with APPDETAILS_CACHE_LOCK:
+        APPDETAILS_CACHE[app_id] = {"created_at": created_at, "data": details}
+        APPDETAILS_CACHE.move_to_end(app_id)
+        while len(APPDETAILS_CACHE) > APPDETAILS_CACHE_MAX_ITEMS:
+            APPDETAILS_CACHE.popitem(last=False)
+
 def fetch_steam_appdetails(app_id: str) -> Optional[Dict[str, str]]:
     if not app_id:
         return None
+    app_id = str(app_id)
 
     _purge_appdetails_cache()
 
-    cached = APPDETAILS_CACHE.get(str(app_id))
-    if isinstance(cached, dict):
-        created_at = float(cached.get("created_at", 0) or 0)
-        if (_now() - created_at) <= APPDETAILS_TTL_SECONDS:
-            data = cached.get("data")
-            return data if isinstance(data, dict) else None
+    with APPDETAILS_CACHE_LOCK:
+        cached = APPDETAILS_CACHE.get(app_id)
+        if isinstance(cached, dict):
+            if (_now() - cached["created_at"]) <= APPDETAILS_TTL_SECONDS:
+                APPDETAILS_CACHE.move_to_end(app_id)
+                data = cached.get("data")
+                return data if isinstance(data, dict) else None
+
+    stored = _appdetails_db_get(app_id)
+    if stored is not None:
+        created_at, details = stored
+        _remember_appdetails(app_id, created_at, details)
+        return details
 
     url = "https://store.steampowered.com/api/appdetails"
-    params = {"appids": str(app_id), "l": "en", "cc": "US"}
+    params = {"appids": app_id, "l": "en", "cc": "US"}
 
     try:
-        resp = requests.get(url, params=params, timeout=STEAM_TIMEOUT_SECONDS)
+        resp = SESSION.get(url, params=params, timeout=STEAM_TIMEOUT_SECONDS)
         resp.raise_for_status()
-        payload = resp.json()
+        payload = _decode_json(resp)
 
-        node = payload.get(str(app_id), {}) or {}
+        node = payload.get(app_id, {}) or {}
         if not node.get("success"):
             return None
 
@@ -294,38 +694,61 @@ def fetch_steam_appdetails(app_id: str) -> Optional[Dict[str, str]]:
             "release_date": release_date_str,
         }
 
-        APPDETAILS_CACHE[str(app_id)] = {"created_at": _now(), "data": details}
+        created_at = _now()
+        _remember_appdetails(app_id, created_at, details)
+        _appdetails_db_put(app_id, created_at, details)
         return details
 
     except Exception as e:
         print(f"[appdetails] Error for {app_id}: {e}")
         return None
 
-def _steam_get_with_retry(url: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    backoff = 1.0
-    for attempt in range(1, STEAM_RETRY_MAX + 1):
-        try:
-            resp = requests.get(url, params=params, timeout=STEAM_TIMEOUT_SECONDS)
-
-            if resp.status_code in (429, 503):
-                print(f"[steam] {resp.status_code} throttle, attempt {attempt}/{STEAM_RETRY_MAX}, sleeping {backoff}s")
-                time.sleep(backoff)
-                backoff = min(backoff * 2.0, 12.0)
-                continue
+class TokenBucket:
+    """
+    Thread-safe token bucket. acquire() reserves a token and only sleeps once
+    the burst is spent; the sleep happens outside the lock.
+    """
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+_STEAM_PAGE_BUCKET = TokenBucket(STEAM_PAGES_PER_SECOND, STEAM_PAGE_BURST)
 
-            resp.raise_for_status()
-            try:
-                return resp.json()
-            except Exception as e:
-                print(f"[steam] JSON parse error: {e}")
-                return None
+def _steam_get_with_retry(url: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Rate-limited GET + JSON decode. Retries/backoff (incl. Retry-After on
+    429/503) are done by SESSION's urllib3 Retry; by the time an error
+    surfaces here they are exhausted.
+    """
+    _STEAM_PAGE_BUCKET.acquire()
+    try:
+        resp = SESSION.get(url, params=params, timeout=STEAM_TIMEOUT_SECONDS)
+        resp.raise_for_status()
+    except requests.RequestException as e:
+        print(f"[steam] Request failed after {STEAM_RETRY_MAX} attempts: {e}")
+        return None
 
-        except requests.RequestException as e:
-            print(f"[steam] Request error attempt {attempt}/{STEAM_RETRY_MAX}: {e}")
-            time.sleep(backoff)
-            backoff = min(backoff * 2.0, 12.0)
+    try:
+        return _decode_json(resp)
+    except Exception as e:
+        print(f"[steam] JSON parse error: {e}")
+        return None
 
-    return None
+_FETCH_POOL = ThreadPoolExecutor(max_workers=STEAM_FETCH_WORKERS, thread_name_prefix="steam-fetch")
+_APPDETAILS_POOL = ThreadPoolExecutor(max_workers=APPDETAILS_FETCH_WORKERS, thread_name_prefix="appdetails")
 
 def _safe_total_reviews_from_payload(payload: Dict[str, Any]) -> Optional[int]:
     try:
@@ -340,35 +763,51 @@ def _safe_total_reviews_from_payload(payload: Dict[str, Any]) -> Optional[int]:
     except Exception:
         return None
 
-def _tag_themes(review_text: str) -> List[str]:
-    tags: List[str] = []
-    t = review_text or ""
-    for theme, pattern in ALL_PATTERNS.items():
-        if pattern.search(t):
-            tags.append(theme)
-    return tags
-
-def extract_time_sentiment_text(review_text: str) -> str:
+def _tag_themes(review_text: str, lowered: Optional[str] = None) -> int:
+    """
+    Returns the THEME_BITS mask of every theme with a keyword hit.
+    Pass `lowered` when the caller already has review_text.lower().
+    """
+    if lowered is None:
+        lowered = (review_text or "").lower()
+    found = 0
+    for _, bits in _iter_theme_hits(lowered):
+        found |= bits
+        if found == ALL_THEMES_MASK:
+            break
+    return found
+
+def extract_time_sentiment_text(
+    review_text: str,
+    lowered: Optional[str] = None,
+    hits: Optional[List[Tuple[int, int]]] = None,
+) -> str:
+    """
+    `hits` may carry _iter_theme_hits(lowered) from a scan the caller already did.
+    """
     review_text = review_text or ""
     if not review_text.strip():
         return ""
 
-    try:
-        sentences = nltk.sent_tokenize(review_text)
-    except Exception:
-        sentences = [review_text]
+    spans = _sentence_spans(review_text)
+    if lowered is None:
+        lowered = review_text.lower()
 
-    matched: List[str] = []
-    for s in sentences:
-        for pattern in ALL_PATTERNS.values():
-            if pattern.search(s):
-                matched.append(s)
-                break
+    if len(lowered) != len(review_text):
+        # Rare: lowercasing changed offsets (e.g. "İ"), so tag sentence by sentence
+        hit_sentences = [i for i, (a, b) in enumerate(spans) if _tag_themes(review_text[a:b])]
+    else:
+        # One automaton pass over the whole review, hits bucketed into sentences
+        span_ends = [b for _, b in spans]
+        if hits is None:
+            hits = list(_iter_theme_hits(lowered))
+        hit_sentences = sorted({bisect.bisect_right(span_ends, start) for start, _ in hits})
+
+    matched = [review_text[spans[i][0]:spans[i][1]].strip() for i in hit_sentences]
 
     return " ".join(matched).strip() if matched else review_text
 
-def get_review_sentiment_for_time_context(review_text: str) -> Tuple[str, float]:
-    text = extract_time_sentiment_text(review_text)
+def _classify_sentiment(text: str) -> Tuple[str, float]:
     vs = analyzer.polarity_scores(text)
     compound = float(vs.get("compound", 0.0) or 0.0)
 
@@ -378,19 +817,109 @@ def get_review_sentiment_for_time_context(review_text: str) -> Tuple[str, float]
         return "Negative", compound
     return "Neutral", compound
 
-def analyze_theme_reviews(review_list: List[Dict[str, Any]]) -> Dict[str, Any]:
-    pos = 0
-    neg = 0
-    neu = 0
-
-    for r in review_list:
-        label = r.get("sentiment_label")
-        if label == "Positive":
-            pos += 1
-        elif label == "Negative":
-            neg += 1
-        else:
-            neu += 1
+def _score_review(review_text: str) -> Tuple[str, float, int]:
+    """
+    Top-level (picklable) unit of per-review work for the scoring pool.
+    """
+    review_text = review_text or ""
+    lowered = review_text.lower()
+
+    # ONE keyword scan feeds both the theme mask and the sentence selection
+    hits = list(_iter_theme_hits(lowered))
+    theme_mask = 0
+    for _, bits in hits:
+        theme_mask |= bits
+
+    sentiment_label, sentiment_compound = _classify_sentiment(
+        extract_time_sentiment_text(review_text, lowered, hits)
+    )
+    return sentiment_label, sentiment_compound, theme_mask
+
+_SCORE_POOL: Optional[ProcessPoolExecutor] = None
+
+_SCORE_POOL_LOCK = threading.Lock()
+
+def _score_pool_context() -> multiprocessing.context.BaseContext:
+    # The pool is created lazily inside a threaded gunicorn worker, and forking
+    # a process that has live request/fetch threads is unsafe. A forkserver is
+    # started clean, imports this module once (preload), and forks each
+    # scoring worker from that, so workers get VADER without re-importing it.
+    # That first start costs one module import. Windows has no forkserver and
+    # falls back to spawn, where every worker imports the module itself.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload([__name__])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+def _get_score_pool() -> Optional[ProcessPoolExecutor]:
+    global _SCORE_POOL
+    if SCORE_POOL_WORKERS <= 1:
+        return None
+    with _SCORE_POOL_LOCK:
+        if _SCORE_POOL is None:
+            _SCORE_POOL = ProcessPoolExecutor(max_workers=SCORE_POOL_WORKERS, mp_context=_score_pool_context())
+        return _SCORE_POOL
+
+def _discard_score_pool(pool: ProcessPoolExecutor) -> None:
+    global _SCORE_POOL
+    with _SCORE_POOL_LOCK:
+        # Another thread may already have replaced it
+        if _SCORE_POOL is pool:
+            _SCORE_POOL = None
+    # Reap whatever workers are still alive; a fresh pool is made next time
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _text_digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+def _score_reviews(texts: List[str]) -> Tuple[List[Tuple[str, float, int]], int]:
+    """
+    Scores a batch of reviews, serving repeated texts from REVIEW_SCORE_CACHE
+    and scoring each distinct new text once.
+    Returns (scores in input order, texts not scored in this call).
+    """
+    scores: List[Optional[Tuple[str, float, int]]] = [None] * len(texts)
+    keys = [_text_digest(t) for t in texts]
+
+    # digest -> positions of that text in this batch (duplicates on one page too)
+    misses: Dict[bytes, List[int]] = {}
+    with REVIEW_SCORE_CACHE_LOCK:
+        for i, k in enumerate(keys):
+            cached = REVIEW_SCORE_CACHE.get(k)
+            if cached is None:
+                misses.setdefault(k, []).append(i)
+            else:
+                REVIEW_SCORE_CACHE.move_to_end(k)
+                scores[i] = cached
+
+    miss_texts = [texts[positions[0]] for positions in misses.values()]
+    miss_scores: Optional[List[Tuple[str, float, int]]] = None
+    pool = _get_score_pool() if len(miss_texts) >= SCORE_POOL_MIN_BATCH else None
+    if pool is not None:
+        try:
+            miss_scores = list(pool.map(_score_review, miss_texts, chunksize=SCORE_POOL_CHUNK_SIZE))
+        except Exception as e:
+            print(f"[score] Pool error, scoring serially: {e}")
+            _discard_score_pool(pool)
+    if miss_scores is None:
+        miss_scores = [_score_review(t) for t in miss_texts]
+
+    with REVIEW_SCORE_CACHE_LOCK:
+        for (k, positions), score in zip(misses.items(), miss_scores):
+            REVIEW_SCORE_CACHE[k] = score
+            for i in positions:
+                scores[i] = score
+        while len(REVIEW_SCORE_CACHE) > REVIEW_SCORE_CACHE_MAX_ITEMS:
+            REVIEW_SCORE_CACHE.popitem(last=False)
+
+    return scores, len(texts) - len(misses)
+
+def analyze_theme_reviews(sentiment_codes: np.ndarray) -> Dict[str, Any]:
+    counts = np.bincount(sentiment_codes, minlength=len(SENTIMENT_CODES))
+    neu = int(counts[SENTIMENT_CODES["Neutral"]])
+    pos = int(counts[SENTIMENT_CODES["Positive"]])
+    neg = int(counts[SENTIMENT_CODES["Negative"]])
 
     total = pos + neg + neu
     pn_total = pos + neg
@@ -411,47 +940,44 @@ def analyze_theme_reviews(review_list: List[Dict[str, Any]]) -> Dict[str, Any]:
         "negative_percent": round(neg_pct, 2),
     }
 
-def calculate_playtime_distribution(all_reviews: List[Dict[str, Any]]) -> Dict[str, Any]:
-    vals: List[float] = []
-    for r in (all_reviews or []):
-        try:
-            v = float(r.get("playtime_hours", 0) or 0)
-            if v >= 0:
-                vals.append(v)
-        except Exception:
-            continue
+def _playtime_stats(arr: np.ndarray) -> Tuple[float, float, float, np.ndarray]:
+    """
+    (p25, median, p75, histogram) over a non-empty float array. One sort; the
+    quantiles are read off it (same linear interpolation as np.percentile) and
+    bucket counts are 6 binary searches of the edges instead of a pass per value.
+    """
+    s = np.sort(arr)
+    n = s.size
 
-    if not vals:
-        return {
-            "median_hours": 0.0,
-            "percentile_25th": 0.0,
-            "percentile_75th": 0.0,
-            "interpretation": "Not enough playtime data to calculate distribution.",
-            "histogram_buckets": [0] * 7,
-            "histogram_bins_hours": ["<1", "1–5", "5–10", "10–20", "20–50", "50–100", "100+"],
-        }
+    pos = PLAYTIME_QUANTILES * (n - 1)
+    lo = np.floor(pos).astype(np.intp)
+    hi = np.minimum(lo + 1, n - 1)
+    t = pos - lo
+    d = s[hi] - s[lo]
+    p25, median, p75 = np.where(t >= 0.5, s[hi] - d * (1 - t), s[lo] + d * t)
 
-    arr = np.array(vals, dtype=float)
-    arr = arr[~np.isnan(arr)]
-    if arr.size == 0:
-        return {
-            "median_hours": 0.0,
-            "percentile_25th": 0.0,
-            "percentile_75th": 0.0,
-            "interpretation": "Not enough playtime data to calculate distribution.",
-            "histogram_buckets": [0] * 7,
-            "histogram_bins_hours": ["<1", "1–5", "5–10", "10–20", "20–50", "50–100", "100+"],
-        }
+    cuts = np.searchsorted(s, PLAYTIME_BIN_EDGES, side="left")
+    hist = np.diff(cuts, prepend=0, append=n)
+    return float(p25), float(median), float(p75), hist
+
+def _empty_playtime_distribution(interpretation: str) -> Dict[str, Any]:
+    return {
+        "median_hours": 0.0,
+        "percentile_25th": 0.0,
+        "percentile_75th": 0.0,
+        "interpretation": interpretation,
+        "histogram_buckets": [0] * len(PLAYTIME_BIN_LABELS),
+        "histogram_bins_hours": list(PLAYTIME_BIN_LABELS),
+    }
 
-    median = float(np.median(arr))
-    p25 = float(np.percentile(arr, 25))
-    p75 = float(np.percentile(arr, 75))
+def calculate_playtime_distribution(playtime_hours: np.ndarray) -> Dict[str, Any]:
+    arr = np.asarray(playtime_hours, dtype=float)
+    arr = arr[arr >= 0]  # also drops NaN
 
-    # IMPORTANT: last edge must always be > 100 to keep bins increasing
-    last_edge = max(100.0, float(np.max(arr))) + 1.0
+    if arr.size == 0:
+        return _empty_playtime_distribution("Not enough playtime data to calculate distribution.")
 
-    bins = [0, 1, 5, 10, 20, 50, 100, last_edge]
-    hist, _ = np.histogram(arr, bins=bins)
+    p25, median, p75, hist = _playtime_stats(arr)
 
     return {
         "median_hours": round(median, 2),
@@ -459,191 +985,44 @@ def calculate_playtime_distribution(all_reviews: List[Dict[str, Any]]) -> Dict[s
         "percentile_75th": round(p75, 2),
         "interpretation": "Distribution based on total playtime hours from the collected reviews.",
         "histogram_buckets": [int(x) for x in hist.tolist()],
-        "histogram_bins_hours": ["<1", "1–5", "5–10", "10–20", "20–50", "50–100", "100+"],
+        "histogram_bins_hours": list(PLAYTIME_BIN_LABELS),
     }
 
-# =============================================================
-# ROUTES
-# =============================================================
-@app.route("/health", methods=["GET"])
-def health() -> Response:
-    return jsonify({"status": "ok"}), 200
-
-@app.route("/analyze", methods=["POST"])
-def analyze_steam_reviews_api() -> Response:
-    try:
-        data = request.get_json(force=True) or {}
-    except Exception as e:
-        return jsonify({"error": f"Error parsing JSON body: {e}"}), 400
-
-    app_id = str((data.get("app_id") or "")).strip()
-    if not app_id:
-        return jsonify({"error": "Missing 'app_id' in request body."}), 400
-
-    review_count_req = _safe_int(data.get("review_count", 1000), 1000)
-    review_count_req = _clamp(review_count_req, MIN_REVIEW_COUNT, MAX_REVIEW_COUNT)
-
-    review_filter = str((data.get("filter") or "recent")).strip().lower()
-    if review_filter not in {"recent", "updated", "all"}:
-        review_filter = "recent"
-
-    language = str((data.get("language") or "english")).strip().lower() or "english"
-
-    _purge_cache()
-
-    entry = _get_cached_entry(app_id, review_filter, language, review_count_hint=review_count_req)
-    if isinstance(entry, dict):
-        created_at = float(entry.get("created_at", 0) or 0)
-        if (_now() - created_at) > CACHE_TTL_SECONDS:
-            entry = None
-
-    if not entry:
-        entry = {
-            "created_at": _now(),
-            "cursor": "*",
-            "all_reviews": [],
-            "steam_total_reviews": None,
-            "effective_target_count": review_count_req,
-            # legacy storage expected by old /reviews + /export
-            "payload": None,
-            "reviews": [],
-        }
-
-    all_reviews: List[Dict[str, Any]] = entry.get("all_reviews", [])
-    if not isinstance(all_reviews, list):
-        all_reviews = []
-        entry["all_reviews"] = all_reviews
-
-    cursor = entry.get("cursor", "*") or "*"
-
-    steam_total = entry.get("steam_total_reviews", None)
-    if isinstance(steam_total, int) and steam_total >= 0:
-        target_count = _clamp(min(review_count_req, steam_total), MIN_REVIEW_COUNT, MAX_REVIEW_COUNT)
-    else:
-        target_count = review_count_req
-    entry["effective_target_count"] = target_count
-
-    need = max(0, target_count - len(all_reviews))
-
-    if need > 0 and _cursor_ok(cursor):
-        pages_needed = (need // STEAM_REVIEWS_PER_PAGE) + (1 if need % STEAM_REVIEWS_PER_PAGE else 0)
-
-        api_url = f"https://store.steampowered.com/appreviews/{app_id}"
-        params = {
-            "json": 1,
-            "language": language,
-            "filter": review_filter,
-            "num_per_page": STEAM_REVIEWS_PER_PAGE,
-            "cursor": cursor,
-        }
-
-        pages_fetched = 0
-        seen_cursors = set()
-        first_page_seen = False
-
-        while (
-            pages_fetched < pages_needed
-            and len(all_reviews) < target_count
-            and _cursor_ok(params.get("cursor"))
-        ):
-            cur = str(params.get("cursor"))
-            if cur in seen_cursors:
-                break
-            seen_cursors.add(cur)
-
-            pages_fetched += 1
-
-            payload = _steam_get_with_retry(api_url, params)
-            if not payload or payload.get("success") != 1:
-                break
-
-            if not first_page_seen:
-                first_page_seen = True
-                total_reviews = _safe_total_reviews_from_payload(payload)
-                if total_reviews is not None:
-                    entry["steam_total_reviews"] = total_reviews
-                    target_count = _clamp(min(review_count_req, total_reviews), MIN_REVIEW_COUNT, MAX_REVIEW_COUNT)
-                    entry["effective_target_count"] = target_count
-
-                    need = max(0, target_count - len(all_reviews))
-                    pages_needed = (need // STEAM_REVIEWS_PER_PAGE) + (1 if need % STEAM_REVIEWS_PER_PAGE else 0)
-
-            reviews_on_page = payload.get("reviews", []) or []
-            if not reviews_on_page:
-                params["cursor"] = None
-                break
-
-            for review in reviews_on_page:
-                if len(all_reviews) >= target_count:
-                    break
-
-                author = review.get("author", {}) or {}
-                playtime_minutes = author.get("playtime_at_review", author.get("playtime_forever", 0)) or 0
-                review_text = review.get("review", "") or ""
-
-                sentiment_label, sentiment_compound = get_review_sentiment_for_time_context(review_text)
-                theme_tags = _tag_themes(review_text)
-
-                all_reviews.append(
-                    {
-                        "review_text": review_text,
-                        "playtime_hours": round(float(playtime_minutes) / 60.0, 1),
-                        "sentiment_label": sentiment_label,
-                        "sentiment_compound": round(float(sentiment_compound), 4),
-                        "theme_tags": theme_tags,
-                    }
-                )
-
-            new_cursor = payload.get("cursor")
-            params["cursor"] = new_cursor if _cursor_ok(new_cursor) else None
-            cursor = params["cursor"]
-
-            time.sleep(REQUEST_SLEEP_SECONDS)
-
-        entry["cursor"] = cursor
-        entry["created_at"] = _now()
-        entry["all_reviews"] = all_reviews
-
-        if entry.get("steam_total_reviews", None) is None and not _cursor_ok(cursor):
-            entry["steam_total_reviews"] = len(all_reviews)
+def _resolve_appdetails(app_id: str) -> Dict[str, str]:
+    return fetch_steam_appdetails(app_id) or {
+        "developer": "N/A",
+        "publisher": "N/A",
+        "header_image_url": "",
+        "release_date": "",
+    }
 
-    effective_target = _safe_int(entry.get("effective_target_count", review_count_req), review_count_req)
+def _build_analyze_payload(
+    app_id: str,
+    review_filter: str,
+    language: str,
+    review_count_req: int,
+    effective_target: int,
+    entry: CacheEntry,
+    all_reviews: ReviewColumns,
+    sentiment_cache_hits: int,
+) -> Dict[str, Any]:
+    steam_total = entry.steam_total_reviews
     analysed_count = min(effective_target, len(all_reviews))
-    reviews_used = all_reviews[:analysed_count]
-
-    themed_used = [r for r in reviews_used if (r.get("theme_tags") or [])]
-    themed_by = {"length": [], "grind": [], "value": []}
-    for r in themed_used:
-        for t in (r.get("theme_tags") or []):
-            if t in themed_by:
-                themed_by[t].append(r)
+    themed_count = int(all_reviews.themed_indices(analysed_count).size)
 
-    length_analysis = analyze_theme_reviews(themed_by["length"])
-    grind_analysis = analyze_theme_reviews(themed_by["grind"])
-    value_analysis = analyze_theme_reviews(themed_by["value"])
+    sentiment_codes = all_reviews.sentiment_code
+    length_analysis = analyze_theme_reviews(sentiment_codes[all_reviews.theme_indices("length", analysed_count)])
+    grind_analysis = analyze_theme_reviews(sentiment_codes[all_reviews.theme_indices("grind", analysed_count)])
+    value_analysis = analyze_theme_reviews(sentiment_codes[all_reviews.theme_indices("value", analysed_count)])
 
     # FIX 1: indentation + safe fallback
     try:
-        playtime_distribution = calculate_playtime_distribution(reviews_used)
+        playtime_distribution = calculate_playtime_distribution(all_reviews.playtime_hours[:analysed_count])
     except Exception as e:
         print(f"[playtime] Error: {e}")
-        playtime_distribution = {
-            "median_hours": 0.0,
-            "percentile_25th": 0.0,
-            "percentile_75th": 0.0,
-            "interpretation": "Playtime distribution could not be calculated.",
-            "histogram_buckets": [0] * 7,
-            "histogram_bins_hours": ["<1", "1–5", "5–10", "10–20", "20–50", "50–100", "100+"],
-        }
-
-    appdetails = fetch_steam_appdetails(app_id) or {
-        "developer": "N/A",
-        "publisher": "N/A",
-        "header_image_url": "",
-        "release_date": "",
-    }
+        playtime_distribution = _empty_playtime_distribution("Playtime distribution could not be calculated.")
 
-    steam_total = entry.get("steam_total_reviews", None)
+    appdetails = _resolve_appdetails(app_id)
 
     note = None
     if isinstance(steam_total, int) and steam_total >= 0 and steam_total < review_count_req:
@@ -651,10 +1030,10 @@ def analyze_steam_reviews_api() -> Response:
 
     if analysed_count == 0:
         note = (note + " " if note else "") + "No reviews were returned by Steam for this filter/language."
-    elif len(themed_used) == 0:
+    elif themed_count == 0:
         note = (note + " " if note else "") + f"No time-centric keywords were found in the {analysed_count} reviews analysed."
 
-    payload_out: Dict[str, Any] = {
+    return {
         "status": "success",
         "app_id": app_id,
         "review_filter": review_filter,
@@ -669,13 +1048,14 @@ def analyze_steam_reviews_api() -> Response:
 
         "cache_progress": {
             "cached_total_reviews": len(all_reviews),
-            "cursor_is_none": entry.get("cursor") is None,
-            "can_fetch_more": _cursor_ok(entry.get("cursor")) and len(all_reviews) < MAX_REVIEW_COUNT,
+            "cursor_is_none": entry.cursor is None,
+            "can_fetch_more": _cursor_ok(entry.cursor) and len(all_reviews) < MAX_REVIEW_COUNT,
             "effective_target_count": effective_target,
+            "sentiment_cache_hits": sentiment_cache_hits,
         },
 
         "total_reviews_collected": analysed_count,
-        "total_themed_reviews": len(themed_used),
+        "total_themed_reviews": themed_count,
 
         "appdetails": appdetails,
 
@@ -717,12 +1097,177 @@ def analyze_steam_reviews_api() -> Response:
         },
     }
 
-    entry["payload"] = payload_out
-    entry["reviews"] = themed_used  # legacy: themed reviews list for paging/export
-    entry["created_at"] = _now()
-    entry["all_reviews"] = all_reviews
-    entry["effective_target_count"] = effective_target
+def _target_count(entry: CacheEntry, review_count_req: int) -> int:
+    steam_total = entry.steam_total_reviews
+    if isinstance(steam_total, int) and steam_total >= 0:
+        return _clamp(min(review_count_req, steam_total), MIN_REVIEW_COUNT, MAX_REVIEW_COUNT)
+    return review_count_req
+
+def _will_fetch(entry: CacheEntry, review_count_req: int) -> bool:
+    # Same cursor expression the page loop starts from
+    return len(entry.columns) < _target_count(entry, review_count_req) and _cursor_ok(entry.cursor or "*")
+
+def _run_analysis(app_id: str, review_count_req: int, review_filter: str, language: str) -> Dict[str, Any]:
+    """
+    Fetch/extend + score + summarise for one /analyze call. Caller holds the
+    _analysis_lock for this (app_id, filter, language).
+    """
+    _purge_cache()
+
+    entry = _get_cached_entry(app_id, review_filter, language, review_count_hint=review_count_req)
+    if entry is not None and (_now() - entry.created_at) > CACHE_TTL_SECONDS:
+        entry = None
+
+    review_texts = _get_review_texts(entry) if entry else None
+    if review_texts is None:
+        # Text evicted (normally the entry goes with it): rebuild, so this run
+        # can extend the columns and /reviews + /export work again afterwards.
+        entry = None
+    will_fetch = entry is None or _will_fetch(entry, review_count_req)
+
+    if entry is None:
+        entry = CacheEntry(
+            cache_id=str(next(_CACHE_ID_SEQ)),
+            created_at=_now(),
+            effective_target_count=review_count_req,
+        )
+        review_texts = []
+
+    all_reviews = entry.columns
+    cursor = entry.cursor or "*"
+
+    target_count = _target_count(entry, review_count_req)
+    entry.effective_target_count = target_count
+
+    need = max(0, target_count - len(all_reviews))
+    sentiment_cache_hits = 0
+
+    if will_fetch:
+        all_reviews.reserve(target_count)
+        pages_needed = (need // STEAM_REVIEWS_PER_PAGE) + (1 if need % STEAM_REVIEWS_PER_PAGE else 0)
+
+        api_url = f"https://store.steampowered.com/appreviews/{app_id}"
+        params = {
+            "json": 1,
+            "language": language,
+            "filter": review_filter,
+            "num_per_page": STEAM_REVIEWS_PER_PAGE,
+            "cursor": cursor,
+        }
+
+        pages_fetched = 1
+        seen_cursors = {cursor}
+        first_page_seen = False
+
+        # One-page lookahead: the next page is requested (through the page
+        # rate limiter) on a fetch thread while this one is scored.
+        pending = _FETCH_POOL.submit(_steam_get_with_retry, api_url, dict(params))
+
+        while pending is not None:
+            payload = pending.result()
+            pending = None
+            if not payload or payload.get("success") != 1:
+                break
+
+            if not first_page_seen:
+                first_page_seen = True
+                total_reviews = _safe_total_reviews_from_payload(payload)
+                if total_reviews is not None:
+                    entry.steam_total_reviews = total_reviews
+                    target_count = _clamp(min(review_count_req, total_reviews), MIN_REVIEW_COUNT, MAX_REVIEW_COUNT)
+                    entry.effective_target_count = target_count
+
+                    need = max(0, target_count - len(all_reviews))
+                    pages_needed = (need // STEAM_REVIEWS_PER_PAGE) + (1 if need % STEAM_REVIEWS_PER_PAGE else 0)
+
+            reviews_on_page = payload.get("reviews", []) or []
+            if not reviews_on_page:
+                params["cursor"] = None
+                break
+
+            reviews_on_page = reviews_on_page[: max(0, target_count - len(all_reviews))]
+
+            new_cursor = payload.get("cursor")
+            params["cursor"] = new_cursor if _cursor_ok(new_cursor) else None
+            cursor = params["cursor"]
+
+            if (
+                pages_fetched < pages_needed
+                and len(all_reviews) + len(reviews_on_page) < target_count
+                and _cursor_ok(cursor)
+                and cursor not in seen_cursors
+            ):
+                seen_cursors.add(cursor)
+                pages_fetched += 1
+                pending = _FETCH_POOL.submit(_steam_get_with_retry, api_url, dict(params))
+
+            page_texts: List[str] = []
+            page_playtimes: List[Any] = []
+            for review in reviews_on_page:
+                author = review.get("author", {}) or {}
+                page_playtimes.append(author.get("playtime_at_review", author.get("playtime_forever", 0)) or 0)
+                page_texts.append(review.get("review", "") or "")
+
+            page_scores, page_cache_hits = _score_reviews(page_texts)
+            sentiment_cache_hits += page_cache_hits
+
+            # Python round() kept on purpose: np.round disagrees on ~7% of
+            # minutes/60 values (it rounds a scaled copy, not the exact double)
+            review_texts.extend(page_texts)
+            all_reviews.extend(
+                playtime_hours=[round(float(m) / 60.0, 1) for m in page_playtimes],
+                scores=[(label, round(float(c), 4), mask) for label, c, mask in page_scores],
+            )
+
+        entry.cursor = cursor
+        entry.created_at = _now()
+
+        if entry.steam_total_reviews is None and not _cursor_ok(cursor):
+            entry.steam_total_reviews = len(all_reviews)
+
+    effective_target = entry.effective_target_count
+
+    # The payload only depends on this state; if none of it moved since the
+    # stored payload was built (typical frontend re-poll), reuse it.
+    payload_key = (
+        review_count_req,
+        effective_target,
+        len(all_reviews),
+        entry.cursor,
+        entry.steam_total_reviews,
+    )
+    payload_out = entry.payload
+    if payload_out is not None and entry.payload_key == payload_key:
+        # appdetails is re-resolved (memoised) so an N/A fallback from a
+        # failed lookup doesn't stick to the entry until it expires.
+        patch: Dict[str, Any] = {}
+        appdetails = _resolve_appdetails(app_id)
+        if payload_out["appdetails"] != appdetails:
+            patch["appdetails"] = appdetails
+        progress = payload_out["cache_progress"]
+        if progress["sentiment_cache_hits"] != sentiment_cache_hits:
+            patch["cache_progress"] = {**progress, "sentiment_cache_hits": sentiment_cache_hits}
+        if patch:
+            payload_out = {**payload_out, **patch}
+    else:
+        payload_out = _build_analyze_payload(
+            app_id=app_id,
+            review_filter=review_filter,
+            language=language,
+            review_count_req=review_count_req,
+            effective_target=effective_target,
+            entry=entry,
+            all_reviews=all_reviews,
+            sentiment_cache_hits=sentiment_cache_hits,
+        )
+
+    entry.payload = payload_out
+    entry.payload_key = payload_key
+    entry.created_at = _now()
 
+    if review_texts is not None:
+        _store_review_texts(entry, review_texts)
+    analysed_count = payload_out["review_count_analyzed"]
     _store_entry_under_keys(
         entry=entry,
         app_id=app_id,
@@ -732,6 +1277,38 @@ def analyze_steam_reviews_api() -> Response:
         effective_count=analysed_count if analysed_count > 0 else review_count_req,
     )
 
+    return payload_out
+
+# =============================================================
+# ROUTES
+# =============================================================
+@app.route("/health", methods=["GET"])
+def health() -> Response:
+    return jsonify({"status": "ok"}), 200
+
+@app.route("/analyze", methods=["POST"])
+def analyze_steam_reviews_api() -> Response:
+    try:
+        data = request.get_json(force=True) or {}
+    except Exception as e:
+        return jsonify({"error": f"Error parsing JSON body: {e}"}), 400
+
+    app_id = str((data.get("app_id") or "")).strip()
+    if not app_id:
+        return jsonify({"error": "Missing 'app_id' in request body."}), 400
+
+    review_count_req = _safe_int(data.get("review_count", 1000), 1000)
+    review_count_req = _clamp(review_count_req, MIN_REVIEW_COUNT, MAX_REVIEW_COUNT)
+
+    review_filter = str((data.get("filter") or "recent")).strip().lower()
+    if review_filter not in {"recent", "updated", "all"}:
+        review_filter = "recent"
+
+    language = str((data.get("language") or "english")).strip().lower() or "english"
+
+    with _analysis_lock(_make_keys(app_id, review_filter, language, None)[0]):
+        payload_out = _run_analysis(app_id, review_count_req, review_filter, language)
+
     return jsonify(payload_out), 200
 
 @app.route("/search", methods=["POST"])
@@ -751,16 +1328,30 @@ def search_game() -> Response:
     params = {"term": partial_name, "l": "en", "cc": "US", "page": 1}
 
     try:
-        response = requests.get(search_api_url, params=params, timeout=STEAM_TIMEOUT_SECONDS)
+        response = SESSION.get(search_api_url, params=params, timeout=STEAM_TIMEOUT_SECONDS)
         response.raise_for_status()
-        store_data = response.json()
+        store_data = _decode_json(response)
 
-        matches: List[Dict[str, Any]] = []
+        # Only the first SEARCH_MAX_RESULTS are returned, so only look those up,
+        # and do it concurrently (latency = slowest call, not the sum).
+        items: List[Dict[str, Any]] = []
         for item in (store_data.get("items", []) or []):
+            if (item.get("id") or item.get("appid")) and item.get("name"):
+                items.append(item)
+                if len(items) >= SEARCH_MAX_RESULTS:
+                    break
+
+        details_list = list(
+            _APPDETAILS_POOL.map(
+                fetch_steam_appdetails,
+                [str(item.get("id") or item.get("appid")) for item in items],
+            )
+        )
+
+        matches: List[Dict[str, Any]] = []
+        for item, details in zip(items, details_list):
             game_id = item.get("id") or item.get("appid")
             name = item.get("name")
-            if not game_id or not name:
-                continue
 
             header_image = (
                 item.get("header_image")
@@ -775,7 +1366,6 @@ def search_game() -> Response:
             publisher = "N/A"
             release_date = ""
 
-            details = fetch_steam_appdetails(str(game_id))
             if details:
                 developer = details.get("developer") or "N/A"
                 publisher = details.get("publisher") or "N/A"
@@ -784,8 +1374,6 @@ def search_game() -> Response:
                 if header_from_details:
                     header_image = header_from_details
 
-            time.sleep(APPDETAILS_ITEM_SLEEP_SECONDS)
-
             matches.append(
                 {
                     "appid": str(game_id),
@@ -797,53 +1385,66 @@ def search_game() -> Response:
                 }
             )
 
-        return jsonify({"results": matches[:10]}), 200
+        return jsonify({"results": matches}), 200
 
     except Exception as e:
         print(f"[search] Error: {e}")
         return jsonify({"error": "Failed to connect to Steam Search API."}), 500
 
-@app.route("/reviews", methods=["GET"])
-def get_paginated_reviews() -> Response:
-    app_id = str((request.args.get("app_id") or "")).strip()
-    offset = _safe_int(request.args.get("offset", 0), 0)
-    limit = _safe_int(request.args.get("limit", DEFAULT_REVIEW_CHUNK_SIZE), DEFAULT_REVIEW_CHUNK_SIZE)
+@dataclass(slots=True)
+class ReviewSelection:
+    """
+    Rows of a cached analysis picked for one /reviews or /export call.
+    """
+    app_id: str
+    review_filter: str
+    language: str
+    columns: ReviewColumns
+    review_texts: List[str]
+    effective_target: int
+    total_count: int
+    themed: np.ndarray
+    rows: np.ndarray
+    mode: str
+
+def _cached_review_selection(args: Any, not_found_error: str) -> Tuple[Optional[ReviewSelection], Optional[Tuple[Response, int]]]:
+    """
+    Shared /reviews + /export lookup and row selection.
+    Returns (selection, None) on success, or (None, error_response).
+    """
+    app_id = str((args.get("app_id") or "")).strip()
 
-    review_filter = str((request.args.get("filter") or "recent")).strip().lower()
+    review_filter = str((args.get("filter") or "recent")).strip().lower()
     if review_filter not in {"recent", "updated", "all"}:
         review_filter = "recent"
 
-    language = str((request.args.get("language") or "english")).strip().lower() or "english"
+    language = str((args.get("language") or "english")).strip().lower() or "english"
 
-    total_count_raw = request.args.get("total_count", None)
+    total_count_raw = args.get("total_count", None)
     total_count_hint = _safe_int(total_count_raw, 0) if total_count_raw is not None else None
 
-    # FIX 2: do NOT fallback to returning all reviews by default
-    themed_only = _truthy_flag(request.args.get("themed_only", "1"), default=True)
-    fallback_to_all_if_none = _truthy_flag(request.args.get("fallback_to_all_if_none", "0"), default=False)
+    # FIX 2/3: do NOT fallback to returning/exporting all reviews by default
+    themed_only = _truthy_flag(args.get("themed_only", "1"), default=True)
+    fallback_to_all_if_none = _truthy_flag(args.get("fallback_to_all_if_none", "0"), default=False)
 
     if not app_id:
-        return jsonify({"error": "Missing 'app_id' parameter."}), 400
-
-    limit = _clamp(limit, 1, 200)
-    offset = max(0, offset)
+        return None, (jsonify({"error": "Missing 'app_id' parameter."}), 400)
 
     _purge_cache()
 
     cached = _get_cached_entry(app_id, review_filter, language, review_count_hint=total_count_hint)
     if cached is None:
-        return jsonify({"error": "Analysis data not found. Please run /analyze first."}), 404
+        return None, (jsonify({"error": not_found_error}), 404)
 
-    created_at = float(cached.get("created_at", 0) or 0)
-    if (_now() - created_at) > CACHE_TTL_SECONDS:
-        return jsonify({"error": "Analysis cache expired. Please run /analyze again."}), 404
+    if (_now() - cached.created_at) > CACHE_TTL_SECONDS:
+        return None, (jsonify({"error": "Analysis cache expired. Please run /analyze again."}), 404)
 
-    all_reviews = cached.get("all_reviews", [])
-    if not isinstance(all_reviews, list):
-        all_reviews = []
+    review_texts = _get_review_texts(cached)
+    if review_texts is None:
+        return None, (jsonify({"error": "Review text is no longer cached. Please run /analyze again."}), 404)
 
-    effective_target = _safe_int(cached.get("effective_target_count", 1000), 1000)
-    effective_target = _clamp(effective_target, MIN_REVIEW_COUNT, MAX_REVIEW_COUNT)
+    all_reviews = cached.columns
+    effective_target = _clamp(cached.effective_target_count, MIN_REVIEW_COUNT, MAX_REVIEW_COUNT)
 
     if total_count_hint is None or total_count_hint <= 0:
         total_count = min(effective_target, len(all_reviews))
@@ -851,103 +1452,100 @@ def get_paginated_reviews() -> Response:
         total_count = _clamp(total_count_hint, MIN_REVIEW_COUNT, MAX_REVIEW_COUNT)
         total_count = min(total_count, len(all_reviews))
 
-    reviews_used = all_reviews[:total_count]
-    themed = [r for r in reviews_used if (r.get("theme_tags") or [])]
+    all_idx = np.arange(total_count)
+    themed = all_reviews.themed_indices(total_count)
+
+    mode = "themed" if themed_only else "all"
+    rows = themed if themed_only else all_idx
+
+    if themed_only and fallback_to_all_if_none and len(rows) == 0 and total_count > 0:
+        rows = all_idx
+        mode = "all_fallback"
+
+    return ReviewSelection(
+        app_id=app_id,
+        review_filter=review_filter,
+        language=language,
+        columns=all_reviews,
+        review_texts=review_texts,
+        effective_target=effective_target,
+        total_count=total_count,
+        themed=themed,
+        rows=rows,
+        mode=mode,
+    ), None
+
+@app.route("/reviews", methods=["GET"])
+def get_paginated_reviews() -> Response:
+    offset = _safe_int(request.args.get("offset", 0), 0)
+    limit = _safe_int(request.args.get("limit", DEFAULT_REVIEW_CHUNK_SIZE), DEFAULT_REVIEW_CHUNK_SIZE)
+
+    limit = _clamp(limit, 1, 200)
+    offset = max(0, offset)
 
-    mode_returned = "themed" if themed_only else "all"
-    items = themed if themed_only else reviews_used
+    sel, error = _cached_review_selection(request.args, "Analysis data not found. Please run /analyze first.")
+    if error is not None:
+        return error
 
-    if themed_only and fallback_to_all_if_none and len(items) == 0 and len(reviews_used) > 0:
-        items = reviews_used
-        mode_returned = "all_fallback"
+    all_reviews = sel.columns
+    review_texts = sel.review_texts
+    items = sel.rows
 
     start_index = offset
     end_index = offset + limit
-    page = items[start_index:end_index]
+    page = [all_reviews.row(i, review_texts[i]) for i in items[start_index:end_index].tolist()]
 
     return jsonify(
         {
             "reviews": page,
-            "mode_returned": mode_returned,
+            "mode_returned": sel.mode,
             "total_available": len(items),
-            "themed_total_available": len(themed),
-            "all_total_available": len(reviews_used),
+            "themed_total_available": len(sel.themed),
+            "all_total_available": sel.total_count,
             "offset": offset,
             "limit": limit,
-            "total_count_used_for_paging": total_count,
-            "effective_target_count": effective_target,
+            "total_count_used_for_paging": sel.total_count,
+            "effective_target_count": sel.effective_target,
         }
     ), 200
 
 @app.route("/export", methods=["GET"])
 def export_reviews_csv() -> Response:
-    app_id = str((request.args.get("app_id") or "")).strip()
-
-    review_filter = str((request.args.get("filter") or "recent")).strip().lower()
-    if review_filter not in {"recent", "updated", "all"}:
-        review_filter = "recent"
-
-    language = str((request.args.get("language") or "english")).strip().lower() or "english"
-
-    total_count_raw = request.args.get("total_count", None)
-    total_count_hint = _safe_int(total_count_raw, 0) if total_count_raw is not None else None
-
-    themed_only = _truthy_flag(request.args.get("themed_only", "1"), default=True)
-    # FIX 3: do NOT fallback to exporting all reviews by default
-    fallback_to_all_if_none = _truthy_flag(request.args.get("fallback_to_all_if_none", "0"), default=False)
-
-    if not app_id:
-        return jsonify({"error": "Missing 'app_id' parameter."}), 400
-
-    _purge_cache()
-
-    cached = _get_cached_entry(app_id, review_filter, language, review_count_hint=total_count_hint)
-    if cached is None:
-        return jsonify({"error": "Review data not found in cache. Please run /analyze first."}), 404
-
-    created_at = float(cached.get("created_at", 0) or 0)
-    if (_now() - created_at) > CACHE_TTL_SECONDS:
-        return jsonify({"error": "Analysis cache expired. Please run /analyze again."}), 404
-
-    all_reviews = cached.get("all_reviews", [])
-    if not isinstance(all_reviews, list):
-        all_reviews = []
-
-    effective_target = _safe_int(cached.get("effective_target_count", 1000), 1000)
-    effective_target = _clamp(effective_target, MIN_REVIEW_COUNT, MAX_REVIEW_COUNT)
-
-    if total_count_hint is None or total_count_hint <= 0:
-        total_count = min(effective_target, len(all_reviews))
-    else:
-        total_count = _clamp(total_count_hint, MIN_REVIEW_COUNT, MAX_REVIEW_COUNT)
-        total_count = min(total_count, len(all_reviews))
-
-    reviews_used = all_reviews[:total_count]
-    themed = [r for r in reviews_used if (r.get("theme_tags") or [])]
-
-    rows = themed if themed_only else reviews_used
-    mode_used = "themed" if themed_only else "all"
-    if themed_only and fallback_to_all_if_none and len(rows) == 0 and len(reviews_used) > 0:
-        rows = reviews_used
-        mode_used = "all_fallback"
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["Sentiment Label", "Sentiment Compound", "Playtime (Hours)", "Theme Tags", "Review Text"])
-
-    for r in rows:
-        sentiment = r.get("sentiment_label", "Neutral")
-        compound = r.get("sentiment_compound", 0.0)
-        playtime = r.get("playtime_hours", 0.0)
-        tags = "|".join(r.get("theme_tags", []) or [])
-        text = (r.get("review_text", "") or "").replace("\n", " ").strip()
-        writer.writerow([sentiment, compound, playtime, tags, text])
-
-    output.seek(0)
-    file_name = f"steam_reviews_{app_id}_{total_count}_{review_filter}_{language}_{mode_used}.csv"
+    sel, error = _cached_review_selection(request.args, "Review data not found in cache. Please run /analyze first.")
+    if error is not None:
+        return error
+
+    all_reviews = sel.columns
+    review_texts = sel.review_texts
+    rows = sel.rows
+
+    def generate_csv() -> Iterator[str]:
+        # One small reusable buffer; rows are gathered from the columns and
+        # written EXPORT_CSV_CHUNK_ROWS at a time with the C writerows path.
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(["Sentiment Label", "Sentiment Compound", "Playtime (Hours)", "Theme Tags", "Review Text"])
+        yield buf.getvalue()
+
+        for start in range(0, len(rows), EXPORT_CSV_CHUNK_ROWS):
+            idx = rows[start:start + EXPORT_CSV_CHUNK_ROWS]
+            buf.seek(0)
+            buf.truncate(0)
+            writer.writerows(zip(
+                [SENTIMENT_LABELS[c] for c in all_reviews.sentiment_code[idx].tolist()],
+                all_reviews.sentiment_compound[idx].tolist(),
+                all_reviews.playtime_hours[idx].tolist(),
+                ["|".join(THEME_NAMES_BY_MASK[m]) for m in all_reviews.theme_mask[idx].tolist()],
+                [(review_texts[i] or "").replace("\n", " ").strip() for i in idx.tolist()],
+            ))
+            yield buf.getvalue()
+
+    file_name = (
+        f"steam_reviews_{sel.app_id}_{sel.total_count}_{sel.review_filter}_{sel.language}_{sel.mode}.csv"
+    )
 
     return Response(
-        output.getvalue(),
+        generate_csv(),
         mimetype="text/csv; charset=utf-8",
         headers={
             "Content-Disposition": f'attachment; filename="{file_name}"',
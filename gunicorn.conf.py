@@ -0,0 +1,11 @@
+# Gunicorn settings (picked up automatically from the working directory).
+# Binds to $PORT on Render.
+import os
+
+# The review/analysis caches live in process memory, so /reviews and /export
+# only find what /analyze stored if every request hits the same process:
+# one worker, with threads for concurrency. Requests spend most of their time
+# waiting on Steam, and VADER scoring already runs in its own process pool.
+workers = 1
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
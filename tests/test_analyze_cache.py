@@ -0,0 +1,102 @@
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault("APPDETAILS_DB_PATH", "")
+os.environ.setdefault("SCORE_POOL_WORKERS", "1")
+
+import requests
+
+import app as app_module
+
+STEAM_TOTAL = 500
+COLLECTABLE = 450  # Steam stops handing out cursors before its own total
+
+
+def _response(payload):
+    resp = requests.models.Response()
+    resp.status_code = 200
+    resp._content = app_module.orjson.dumps(payload)
+    return resp
+
+
+class FakeSteam:
+    def __init__(self):
+        self.review_pages = []
+
+    def get(self, url, params=None, **kwargs):
+        params = params or {}
+        if "appreviews" in url:
+            cursor = params.get("cursor")
+            self.review_pages.append(cursor)
+            start = 0 if cursor == "*" else int(cursor)
+            end = min(start + int(params["num_per_page"]), COLLECTABLE)
+            payload = {
+                "success": 1,
+                "query_summary": {"total_reviews": STEAM_TOTAL} if cursor == "*" else {},
+                "reviews": [
+                    {"review": f"Review {i}: great game, about 10 hours long.", "author": {"playtime_forever": 60 * i}}
+                    for i in range(start, end)
+                ],
+            }
+            if end < COLLECTABLE:
+                payload["cursor"] = str(end)
+            return _response(payload)
+        if "appdetails" in url:
+            return _response({params["appids"]: {"success": False}})
+        raise AssertionError(f"unexpected URL {url}")
+
+
+class AnalyzeCacheTests(unittest.TestCase):
+    def setUp(self):
+        for cache in (app_module.TEMP_REVIEW_CACHE, app_module.CACHE_ALIASES, app_module.REVIEW_TEXT_CACHE):
+            cache.clear()
+        self.steam = FakeSteam()
+        for patcher in (
+            mock.patch.object(app_module.SESSION, "get", side_effect=self.steam.get),
+            mock.patch.object(app_module._STEAM_PAGE_BUCKET, "acquire"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = app_module.app.test_client()
+
+    def analyze(self, app_id="10", review_count=STEAM_TOTAL):
+        return self.client.post("/analyze", json={"app_id": app_id, "review_count": review_count})
+
+    def test_repoll_after_text_eviction_with_exhausted_cursor(self):
+        first = self.analyze()
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.get_json()["review_count_analyzed"], COLLECTABLE)
+
+        app_module.REVIEW_TEXT_CACHE.clear()
+
+        again = self.analyze()
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.get_json()["review_count_analyzed"], COLLECTABLE)
+
+    def test_reviews_recover_after_rerun_once_text_is_evicted(self):
+        # 300 of 450 collectable: the re-run needs no more pages on its own
+        self.assertEqual(self.analyze(review_count=300).status_code, 200)
+        app_module.REVIEW_TEXT_CACHE.clear()
+        self.assertEqual(self.client.get("/reviews?app_id=10").status_code, 404)
+
+        pages_before = len(self.steam.review_pages)
+        self.assertEqual(self.analyze(review_count=300).status_code, 200)
+        self.assertGreater(len(self.steam.review_pages), pages_before)
+        self.assertEqual(self.client.get("/reviews?app_id=10").status_code, 200)
+
+    def test_text_eviction_evicts_the_analysis(self):
+        for n in range(app_module.CACHE_MAX_TEXT_ITEMS + 1):
+            self.assertEqual(self.analyze(app_id=str(100 + n)).status_code, 200)
+
+        self.assertEqual(set(app_module.TEMP_REVIEW_CACHE), set(app_module.REVIEW_TEXT_CACHE))
+        self.assertEqual(self.client.get("/reviews?app_id=100").status_code, 404)
+
+        pages_before = len(self.steam.review_pages)
+        self.assertEqual(self.analyze(app_id="100").status_code, 200)
+        self.assertGreater(len(self.steam.review_pages), pages_before)
+        self.assertEqual(self.client.get("/reviews?app_id=100").status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()